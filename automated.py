@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
+import argparse
 import sys
 import uuid
 import os
+import time
 from poster_api_tester import PosterAPITester
+from config import clear_token, load_config, login_with_cache
+# profiler, soak, fuzz, store and requests itself are imported only by the modes
+# that need them, a probe from cron should not pay for all of them on startup
 
 # global counter for total tests passed
 tests_passed = 0
 
+TEST_MODES = ("get", "set", "ep", "bva", "soak", "fuzz", "probe")
+STORE_COMMANDS = ("runs", "query", "compare")
+
 """
 there are 2 modes, get and set mode
 
@@ -32,15 +40,15 @@ def check(response, test_name, expected_key=None):
     print(f"{test_name}: PASS")
 
 # the main function for the get mode, we pass in the instance of our poster-api-tester
-def test_get_mode(tester):
+def test_get_mode(tester, config):
     print("\n========== GET MODE ==========")
 
-    # login as test2, we know this account exists
-    resp = tester.login_user("test2", "Hello@123")
+    # login as the profile user (test2 by default), we know this account exists
+    resp = tester.login_user(config["username"], config["password"])
     check(resp, "login (get mode)", expected_key="token")
     
     # 2. get profile for test 2 (response is { "message": "...", "user": { ... } } )
-    profile = tester.get_profile("test2")
+    profile = tester.get_profile(config["username"])
 
     assert "user" in profile, f"get profile (get mode) FAILED: expected key 'user' not found in {profile}"
     user_obj = profile["user"]
@@ -63,12 +71,12 @@ def test_get_mode(tester):
     check(convos, "get conversations (get mode)")
     
     # 6. get following list
-    test2_id = user_obj.get("id", "test2")
-    following = tester.get_following(test2_id)
+    user_id = user_obj.get("id", config["username"])
+    following = tester.get_following(user_id)
     check(following, "get following (get mode)")
     
     # 7. get followers list
-    followers = tester.get_followers(test2_id)
+    followers = tester.get_followers(user_id)
     check(followers, "get followers (get mode)")
     
     # 8. search posts with query
@@ -80,7 +88,7 @@ def test_get_mode(tester):
     reports = tester.get_reports(page=1)
     # check(reports, "Get Reports (get mode)")
 
-def test_set_mode(tester):
+def test_set_mode(tester, config):
     print("\n========== SET MODE ==========")
     global tests_passed
 
@@ -145,12 +153,12 @@ def test_set_mode(tester):
     # no notif testing for now
     # TODO
     
-    # 14. follow user, (test2 userId here)
-    follow = tester.follow_user("c68f1430-35ef-4ebf-a56e-b9d534492f24") # userId for test2 
+    # 14. follow user, (profile user_id here)
+    follow = tester.follow_user(config["user_id"]) # user_id from the config profile
     check(follow, "follow user (set mode)")
     
-    # 15. start convo with test2
-    convo = tester.start_conversation(["c68f1430-35ef-4ebf-a56e-b9d534492f24"]) # again userId for test2
+    # 15. start convo with the profile user_id
+    convo = tester.start_conversation([config["user_id"]]) # again user_id from the config profile
     check(convo, "start convo (set mode)", expected_key="conversationId")
     convo_id = convo.get("conversationId")
     
@@ -204,22 +212,22 @@ def test_set_mode(tester):
     del_account = tester.delete_account(user_id, updated_username, new_password)
     check(del_account, "delete account (new user - set mode)")
 
-def test_equivalence_partitioning(tester):
+def test_equivalence_partitioning(tester, config):
     global tests_passed
     print("\n========== EQUIVALENCE PARTITIONING (EP) ==========")
 
     # EP1: valid login
-    resp = tester.login_user("test2", "Hello@123")
+    resp = tester.login_user(config["username"], config["password"])
     check(resp, "EP1: valid login", expected_key="token")
 
     # EP2: invalid username, valid password
-    resp = tester.login_user("test3", "Hello@123")
+    resp = tester.login_user("test3", config["password"])
     assert "error" in resp, f"EP2: expected login to fail with invalid username, got {resp}"
     print("EP2: invalid username login: PASS")
     tests_passed +=1
 
     # EP3: valid username, invalid password
-    resp = tester.login_user("test2", "Hello@234")
+    resp = tester.login_user(config["username"], "Hello@234")
     assert "error" in resp, f"EP3: expected login to fail with invalid password, got {resp}"
     print("EP3: invalid password login: PASS")
     tests_passed +=1
@@ -250,7 +258,7 @@ def test_equivalence_partitioning(tester):
     print("EP7: invalid username registration: PASS")
     tests_passed +=1
 
-def test_boundary_value_analysis(tester):
+def test_boundary_value_analysis(tester, config):
     global tests_passed
     print("\n========== BOUNDARY VALUE ANALYSIS (BVA) ==========")
 
@@ -288,36 +296,189 @@ def test_boundary_value_analysis(tester):
     check(reg, "BVA5: edge-case valid email", expected_key="user")
 
 
+def test_probe(tester, config, endpoint, params):
+    """
+    call one tester method with the cached login, for ci/cron health checks,
+    anything that goes wrong ends as a "probe FAILED" line, never a traceback
+    """
+    global tests_passed
+    method = getattr(tester, endpoint, None)
+    if endpoint.startswith("_") or not callable(method):
+        raise AssertionError(f"probe FAILED: unknown endpoint '{endpoint}'")
+
+    def attempt(what, fn, *args):
+        try:
+            return fn(*args)
+        except Exception as err:
+            raise AssertionError(f"probe {endpoint} FAILED: {what} raised {type(err).__name__}: {err}")
+
+    from_cache = False
+    if endpoint not in ("login_user", "register_user"):
+        login, from_cache = attempt("login", login_with_cache, tester, config)
+        assert "token" in login, f"probe {endpoint} FAILED: login as {config['username']} failed: {login.get('error', login)}"
+
+    start = time.perf_counter()
+    result = attempt(endpoint, method, *params)
+    if from_cache and str(result.get("error", "")).startswith("401"):
+        # token was revoked server side before it expired, log in again once
+        clear_token(config)
+        attempt("login", login_with_cache, tester, config)
+        start = time.perf_counter()
+        result = attempt(endpoint, method, *params)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    assert "error" not in result, f"probe {endpoint} FAILED ({elapsed:.1f}ms): {result}"
+    tests_passed += 1
+    print(f"probe {endpoint}: PASS {elapsed:.1f}ms ({'cached token' if from_cache else 'fresh login'})")
+
 def main():
-    if len(sys.argv) < 2:
-        # some help
-        print("Usage: python automated.py [get | set | ep | bva ]")
-        sys.exit(1)
-    
+    global tests_passed
+    parser = argparse.ArgumentParser(usage="python automated.py [get | set | ep | bva | soak | fuzz | probe ENDPOINT [ARG..] | runs | query RUN.. | compare RUN RUN ] [--env NAME] [--profile] [--cprofile DIR]")
+    parser.add_argument("mode", type=str.lower)
+    # endpoint + args for probe, run ids for query/compare
+    parser.add_argument("params", nargs="*")
+    # tester profile (base_url, credentials, target ids), see config.py
+    parser.add_argument("--env", help="environment/section in the config file (default POSTER_ENV or prod)")
+    parser.add_argument("--config", help="config file (default POSTER_CONFIG or ./poster.ini)")
+    # attribute wall/cpu per call to client phases (serialize, send, wait, ...)
+    parser.add_argument("--profile", action="store_true")
+    # also dump one cProfile file per endpoint into DIR (implies --profile)
+    parser.add_argument("--cprofile", metavar="DIR")
+    # soak mode options
+    parser.add_argument("--duration", type=float, default=3600, help="soak length in seconds")
+    parser.add_argument("--window", type=float, default=60, help="soak rollup window in seconds")
+    parser.add_argument("--workers", type=int, help="worker threads (soak default 1, fuzz default 16)")
+    # same names as soak.SCENARIOS, listed here so --help does not import soak
+    parser.add_argument("--scenario", choices=("get", "set"), default="get", help="soak scenario")
+    parser.add_argument("--out", default="soak.jsonl", help="soak window file (appended)")
+    # fuzz mode options
+    parser.add_argument("--cases", type=int, default=2000, help="fuzz cases to generate")
+    parser.add_argument("--seed", type=int, help="fuzz rng seed, printed on every run to reproduce")
+    # result store options, every test run is recorded unless --no-store
+    parser.add_argument("--db", default="poster_results.db", help="sqlite result store")
+    parser.add_argument("--no-store", action="store_true", help="dont record this run")
+    parser.add_argument("--endpoint", help="query/compare only this endpoint")
+    parser.add_argument("--since", type=float, help="query/compare from N seconds into the run")
+    parser.add_argument("--until", type=float, help="query/compare up to N seconds into the run")
+    args = parser.parse_args()
+
     # mode is first arg (well second because arg1 is the proc name)
-    mode = sys.argv[1].lower()
-    tester = PosterAPITester(base_url="https://api.poster-social.com")
-    # for local
-    # tester = PosterAPITester(base_url="http://localhost:3000")
-    
+    mode = args.mode
+    if mode in STORE_COMMANDS:
+        run_store_command(parser, args)
+        return
+    if mode not in TEST_MODES:
+        print("invalid mode. choose from: get, set, ep, bva, soak, fuzz, probe, runs, query or compare")
+        sys.exit(1)
+    if mode == "probe" and not args.params:
+        parser.error("probe needs an endpoint, e.g. probe get_feed 1")
+
+    try:
+        config = load_config(args.env, args.config)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    profiler = None
+    if args.profile or args.cprofile:
+        from profiler import ClientProfiler
+        profiler = ClientProfiler(cprofile_dir=args.cprofile)
+    store = None
+    if not args.no_store:
+        from store import ResultStore
+        store = ResultStore(args.db)
+
+    def make_tester():
+        session = None
+        if mode == "probe" and not profiler:
+            # stdlib http, skips importing requests (most of our startup time),
+            # it cant go through a proxy so requests still handles that case
+            from lite_session import LiteSession, uses_proxy
+            if not uses_proxy(config["base_url"]):
+                session = LiteSession()
+        tester = PosterAPITester(base_url=config["base_url"], session=session)
+        # for local, point a profile at http://localhost:3000 (see poster.ini.example)
+        # soak keeps fixed size window rollups, one row per call for hours is what it avoids
+        if store and mode != "soak":
+            store.attach(tester)
+        if profiler:
+            profiler.attach(tester)
+        return tester
+
+    tester = make_tester()
+    workers = args.workers or {"soak": 1, "fuzz": 16}.get(mode, 1)
+    if store:
+        store.start_run(tester.base_url, mode, concurrency=workers)
+
+    status = "failed"
     try:
         if mode == "get":
-            test_get_mode(tester)
+            test_get_mode(tester, config)
         elif mode == "set":
-            test_set_mode(tester)
+            test_set_mode(tester, config)
         elif mode == "ep":
-            test_equivalence_partitioning(tester)
+            test_equivalence_partitioning(tester, config)
         elif mode == "bva":
-            test_boundary_value_analysis(tester)
-        else:
-            print("invalid mode. choose from: get, set, ep or bva")
-            sys.exit(1)
+            test_boundary_value_analysis(tester, config)
+        elif mode == "probe":
+            test_probe(tester, config, args.params[0], args.params[1:])
+        elif mode == "soak":
+            from soak import run_soak
+            # not pass/fail, the summary and window file are the result
+            run_soak(make_tester, args.duration, config["username"], config["password"], window=args.window,
+                     out_path=args.out, workers=workers, scenario=args.scenario)
+            status = "done"
+            return
+        elif mode == "fuzz":
+            from fuzz import run_fuzz
+            passed, failures = run_fuzz(make_tester, count=args.cases, workers=workers, seed=args.seed)
+            tests_passed += passed
+            assert not failures, f"fuzz found {len(failures)} distinct failures (see above)"
+        status = "passed"
     except AssertionError as e:
         print(f"\nTESTS FAILED after {tests_passed} tests")
         print(e)
         sys.exit(1)
+    except KeyboardInterrupt:
+        status = "interrupted"
+        raise
+    finally:
+        if profiler:
+            profiler.report()
+        if store:
+            store.finish_run(status)
         
     print(f"\nALL TESTS PASSED: {tests_passed} tests completed successfully")
 
+def run_store_command(parser, args):
+    """
+    runs, query and compare only read the result store, no api calls
+    """
+    if not os.path.isfile(args.db):
+        print(f"no result store at {args.db}, run a test mode first")
+        sys.exit(1)
+    from store import ResultStore
+    store = ResultStore(args.db)
+    filters = {"endpoint": args.endpoint, "since": args.since, "until": args.until}
+    try:
+        run_ids = [int(run_id) for run_id in args.params]
+    except ValueError:
+        parser.error("run ids must be integers")
+    try:
+        if args.mode == "runs":
+            store.list_runs()
+        elif args.mode == "query":
+            if not run_ids:
+                parser.error("query needs at least one run id")
+            for run_id in run_ids:
+                store.show_run(run_id, **filters)
+        elif args.mode == "compare":
+            if len(run_ids) != 2:
+                parser.error("compare needs exactly two run ids")
+            store.compare(run_ids[0], run_ids[1], **filters)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+import base64
+import configparser
+import json
+import os
+import tempfile
+import time
+
+"""
+tester configuration and auth token cache
+
+profiles live in an ini file (POSTER_CONFIG or ./poster.ini), one section per
+environment, see poster.ini.example. only the implicit ./poster.ini may be missing.
+the profile is picked with --env or POSTER_ENV, every key can be overridden with
+POSTER_<KEY> (POSTER_BASE_URL, ...) and anything missing falls back to DEFAULTS
+(the old hard coded values)
+
+tokens from a login are cached per profile in ~/.cache/poster-api-tester so short
+probes can skip the login until the token expires (jwt exp, or token_ttl seconds
+when the token is not a jwt)
+"""
+
+DEFAULTS = {
+    "base_url": "https://api.poster-social.com",
+    "username": "test2",
+    "password": "Hello@123",
+    "user_id": "c68f1430-35ef-4ebf-a56e-b9d534492f24",
+    "token_ttl": "3600"
+}
+
+DEFAULT_ENV = "prod"
+
+# treat tokens as expired this many seconds early so a probe never races the expiry
+EXPIRY_SKEW = 60
+
+def load_config(env=None, path=None):
+    """
+    settings for one profile as a plain dict, env name included under "env"
+    """
+    env = env or os.environ.get("POSTER_ENV") or DEFAULT_ENV
+    path = path or os.environ.get("POSTER_CONFIG")
+    explicit = bool(path)
+    path = path or "poster.ini"
+
+    parser = configparser.ConfigParser(defaults=DEFAULTS, interpolation=None)
+    # only the implicit ./poster.ini may be missing, a typo in --config or
+    # POSTER_CONFIG must not quietly fall back to production
+    if not parser.read(path) and explicit:
+        raise ValueError(f"config file {path} not found or unreadable")
+    if parser.has_section(env):
+        config = dict(parser[env])
+    elif env == DEFAULT_ENV:
+        config = dict(parser.defaults())
+    else:
+        raise ValueError(f"profile '{env}' not found in {path}")
+
+    for key in DEFAULTS:
+        override = os.environ.get(f"POSTER_{key.upper()}")
+        if override:
+            config[key] = override
+    config["env"] = env
+    return config
+
+def _cache_path(config):
+    cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "poster-api-tester")
+    return os.path.join(cache_dir, f"{config['env']}.json")
+
+def _token_expiry(token, ttl):
+    """
+    exp claim of a jwt, or now + ttl for anything else
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, ValueError, KeyError, TypeError):
+        return time.time() + ttl
+
+def cached_token(config):
+    """
+    token cached for this profile, None if missing, expired or for another url/user
+    """
+    try:
+        with open(_cache_path(config)) as cache:
+            entry = json.load(cache)
+    except (OSError, ValueError):
+        return None
+    if entry.get("base_url") != config["base_url"] or entry.get("username") != config["username"]:
+        return None
+    if entry.get("expires_at", 0) - EXPIRY_SKEW <= time.time():
+        return None
+    return entry.get("token")
+
+def save_token(config, token):
+    path = _cache_path(config)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "base_url": config["base_url"],
+        "username": config["username"],
+        "token": token,
+        "expires_at": _token_expiry(token, float(config["token_ttl"]))
+    }
+    # the token is a credential, keep it readable by the owner only. written to a
+    # temp file next to the cache and renamed over it, so a probe running at the
+    # same time reads the old entry or the new one, never half a file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".token-")
+    try:
+        with os.fdopen(fd, "w") as cache:
+            json.dump(entry, cache)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def clear_token(config):
+    try:
+        os.remove(_cache_path(config))
+    except OSError:
+        pass
+
+def login_with_cache(tester, config):
+    """
+    reuse the cached token for this profile or log in and cache a new one,
+    returns (login result, token came from cache), the result has "token" on success
+    """
+    token = cached_token(config)
+    if token:
+        # same as a successful login_user, without the round trip
+        tester.session.headers.update({"Authorization": f"Bearer {token}"})
+        tester.session.cookies.set("authToken", token)
+        return {"token": token}, True
+
+    result = tester.login_user(config["username"], config["password"])
+    token = result.get("token")
+    if token:
+        save_token(config, token)
+    return result, False
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+import json
+import random
+import re
+import string
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+fuzz mode, generated ep/bva inputs for register_user and login_user
+
+ep/bva check a handful of hand picked values, this generates thousands around the
+same boundaries (lengths around 4, 8 and common maxima, unicode, quoted emails,
+special chars) and runs them on a thread pool
+
+every case is checked against a small oracle (expect_username/email/password) that
+says accept, reject or None when we dont know the server rule yet. a failure is
+    - any 5xx or connection error, validation should never crash the server
+    - accept/reject different from the oracle
+failures are grouped by error class, one example per class is shrunk to a minimal
+input, and the per partition accept/reject table shows where unknown limits are
+"""
+
+ALNUM = string.ascii_lowercase + string.digits
+USERNAME_SPECIALS = " -.!@#$%^&*()+=[]{};:'\",<>/?\\|`~"
+EMAIL_LOCAL_SPECIALS = "!#$%&'*/=?^`{|}~"
+UNICODE_SAMPLES = ["é", "ß", "Ω", "ж", "中文", "日本", "😀", "​", "á", "ﬁ", "Ａ", "‮"]
+INJECTIONS = ["' OR '1'='1", "<script>", "{\"$gt\": \"\"}", "../../etc", "%00", "${7*7}"]
+
+USERNAME_RE = re.compile(r"^[A-Za-z0-9_]+$")
+EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}$")
+
+# last length we are sure the server accepts, above it the oracle says None
+USERNAME_KNOWN_MAX = 20
+PASSWORD_KNOWN_MAX = 64
+EMAIL_LOCAL_KNOWN_MAX = 64
+# rfc 5321 path limit, longer addresses may be rejected even when every part is valid
+EMAIL_KNOWN_MAX = 254
+
+def expect_username(username):
+    if len(username) < 4:
+        return False
+    if USERNAME_RE.match(username) and len(username) <= USERNAME_KNOWN_MAX:
+        return True
+    return None
+
+def expect_password(password):
+    if len(password) < 8:
+        return False
+    classes = [
+        any(c in string.ascii_uppercase for c in password),
+        any(c in string.ascii_lowercase for c in password),
+        any(c in string.digits for c in password),
+        any(c in string.punctuation for c in password)
+    ]
+    if not all(classes):
+        return False
+    if password.isascii() and password.isprintable() and len(password) <= PASSWORD_KNOWN_MAX:
+        return True
+    return None
+
+def expect_email(email):
+    local, at, domain = email.rpartition("@")
+    if not at or not local or "." not in domain:
+        return False
+    if len(email) > EMAIL_KNOWN_MAX:
+        return None
+    if EMAIL_RE.match(email) and len(local) <= EMAIL_LOCAL_KNOWN_MAX and ".." not in local \
+            and not local.startswith(".") and not local.endswith("."):
+        return True
+    return None
+
+def _rand(rng, n, alphabet=ALNUM):
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+def _password_of_length(rng, n):
+    return ("Aa1@" + _rand(rng, max(n - 4, 0)))[:n]
+
+def _username_partitions():
+    parts = []
+    for n in (0, 1, 2, 3, 4, 5, 7, 8, 9, 16, 20, 21, 30, 32, 33, 64, 65, 128, 255, 256):
+        parts.append((f"len_{n}", lambda rng, n=n: _rand(rng, n)))
+    parts.append(("underscore", lambda rng: _rand(rng, 3) + "_" + _rand(rng, 3)))
+    parts.append(("uppercase", lambda rng: _rand(rng, 8, string.ascii_letters)))
+    for ch in USERNAME_SPECIALS:
+        parts.append((f"special_{ch!r}", lambda rng, ch=ch: _rand(rng, 5) + ch + _rand(rng, 2)))
+    for sample in UNICODE_SAMPLES:
+        parts.append((f"unicode_{sample!a}", lambda rng, s=sample: _rand(rng, 4) + s))
+    parts.append(("leading_space", lambda rng: " " + _rand(rng, 6)))
+    parts.append(("trailing_space", lambda rng: _rand(rng, 6) + " "))
+    for injection in INJECTIONS:
+        parts.append((f"injection_{injection!r}", lambda rng, i=injection: i + _rand(rng, 4)))
+    return parts
+
+def _email_partitions():
+    parts = [
+        ("valid", lambda rng: f"{_rand(rng, 10)}@example.com"),
+        ("plus_tag", lambda rng: f"{_rand(rng, 10)}+tag@example.com"),
+        ("subdomain", lambda rng: f"{_rand(rng, 10)}@mail.example.co.uk"),
+        ("uppercase", lambda rng: f"{_rand(rng, 10, string.ascii_letters)}@Example.COM"),
+        ("quoted", lambda rng: f'"{_rand(rng, 10)}"@example.com'),
+        ("quoted_prefix", lambda rng: f'"weird.but.valid"{_rand(rng, 4)}@example.com'),
+        ("quoted_space", lambda rng: f'"has space {_rand(rng, 6)}"@example.com'),
+        ("quoted_at", lambda rng: f'"a@b{_rand(rng, 6)}"@example.com'),
+        ("no_at", lambda rng: f"{_rand(rng, 10)}example.com"),
+        ("double_at", lambda rng: f"{_rand(rng, 10)}@@example.com"),
+        ("no_domain", lambda rng: f"{_rand(rng, 10)}@"),
+        ("no_local", lambda rng: "@example.com"),
+        ("no_tld", lambda rng: f"{_rand(rng, 10)}@example"),
+        ("leading_dot", lambda rng: f".{_rand(rng, 10)}@example.com"),
+        ("trailing_dot", lambda rng: f"{_rand(rng, 10)}.@example.com"),
+        ("double_dot", lambda rng: f"a..{_rand(rng, 10)}@example.com"),
+        ("unicode_local", lambda rng: f"{_rand(rng, 10)}é@example.com"),
+        ("unicode_domain", lambda rng: f"{_rand(rng, 10)}@exämple.com"),
+        ("leading_space", lambda rng: f" {_rand(rng, 10)}@example.com"),
+        ("total_len_255", lambda rng: f"{_rand(rng, 64)}@{_rand(rng, 63)}.{_rand(rng, 63)}.{_rand(rng, 58)}.com")
+    ]
+    for n in (1, 63, 64, 65, 255):
+        parts.append((f"local_len_{n}", lambda rng, n=n: f"{_rand(rng, n)}@example.com"))
+    for ch in EMAIL_LOCAL_SPECIALS:
+        parts.append((f"local_special_{ch!r}", lambda rng, ch=ch: f"{_rand(rng, 8)}{ch}@example.com"))
+    return parts
+
+def _password_partitions():
+    parts = []
+    for n in (0, 1, 7, 8, 9, 16, 32, 63, 64, 65, 72, 73, 128, 256, 1024):
+        parts.append((f"len_{n}", lambda rng, n=n: _password_of_length(rng, n)))
+    parts += [
+        ("missing_upper", lambda rng: "a1@" + _rand(rng, 7)),
+        ("missing_lower", lambda rng: "A1@" + _rand(rng, 7, string.ascii_uppercase + string.digits)),
+        ("missing_digit", lambda rng: "Aa@" + _rand(rng, 7, string.ascii_letters)),
+        ("missing_special", lambda rng: "Aa1" + _rand(rng, 7)),
+        ("only_digits", lambda rng: _rand(rng, 10, string.digits)),
+        ("unicode", lambda rng: "Aa1@" + "é" * 4 + _rand(rng, 2)),
+        ("emoji", lambda rng: "Aa1@" + "😀" * 4),
+        ("unicode_special_only", lambda rng: "Aa1é" + _rand(rng, 6)),
+        ("space_as_special", lambda rng: "Aa1 " + _rand(rng, 6)),
+        ("null_byte", lambda rng: "Aa1@\x00" + _rand(rng, 5))
+    ]
+    return parts
+
+class Case:
+    """
+    one fuzz input, `field` is the value under test, the others are fresh valid
+    fillers on every run so retries and shrinking never collide on uniqueness
+    """
+    def __init__(self, kind, field, partition, value):
+        self.kind = kind
+        self.field = field
+        self.partition = partition
+        self.value = value
+
+    def with_value(self, value):
+        return Case(self.kind, self.field, self.partition, value)
+
+    def expected(self):
+        if self.kind == "login":
+            # fuzzed identifiers never belong to a real account
+            return False
+        return {"username": expect_username, "email": expect_email, "password": expect_password}[self.field](self.value)
+
+def generate_cases(count, rng):
+    """
+    round robin over every (kind, field, partition) with fresh random fill each
+    lap, so small counts still touch every partition
+    """
+    builders = []
+    for field, parts in (("username", _username_partitions()), ("email", _email_partitions()), ("password", _password_partitions())):
+        builders += [("register", field, name, fn) for name, fn in parts]
+    for field, parts in (("username", _username_partitions()), ("email", _email_partitions())):
+        builders += [("login", field, name, fn) for name, fn in parts]
+    builders += [("login", "password", name, fn) for name, fn in _password_partitions()]
+
+    produced = 0
+    while produced < count:
+        for kind, field, partition, fn in builders:
+            if produced >= count:
+                return
+            yield Case(kind, field, partition, fn(rng))
+            produced += 1
+
+def _error_class(result, values):
+    """
+    status code + server message with our own inputs masked, so the same
+    validation error on different inputs dedupes to one class
+    """
+    if "error" not in result:
+        return "accepted"
+    error = str(result["error"])
+    status = error.split(" ", 1)[0]
+    if not status.isdigit():
+        return "client: " + error.split(":", 1)[0][:60]
+    message = result.get("response", "")
+    try:
+        body = json.loads(message)
+        if isinstance(body, dict):
+            message = body.get("message") or body.get("error") or message
+    except (TypeError, ValueError):
+        pass
+    message = str(message)
+    for name, value in values.items():
+        if value:
+            message = message.replace(value, f"<{name}>")
+    return f"{status} {message[:80]}"
+
+class Outcome:
+    def __init__(self, case, accepted, error_class):
+        self.case = case
+        self.accepted = accepted
+        self.error_class = error_class
+        self.expected = case.expected()
+
+    @property
+    def server_error(self):
+        if self.error_class == "accepted":
+            return False
+        return self.error_class.startswith("5") or not self.error_class[:1].isdigit()
+
+    @property
+    def failed(self):
+        return self.server_error or (self.expected is not None and self.accepted != self.expected)
+
+    def key(self):
+        return (self.case.kind, self.case.field, self.expected, self.accepted, self.error_class)
+
+def run_case(tester, case, cleanup=True):
+    suffix = uuid.uuid4().hex[:10]
+    values = {"username": f"fz{suffix}", "email": f"fz{suffix}@example.com", "password": "Aa1@" + suffix}
+    values[case.field] = case.value
+
+    try:
+        if case.kind == "register":
+            result = tester.register_user(values["username"], values["email"], values["password"])
+        else:
+            identifier = values["email"] if case.field == "email" else values["username"]
+            result = tester.login_user(identifier, values["password"])
+    except Exception as err:
+        # anything the tester does not turn into an error dict, one bad case must
+        # not abort the other thousands
+        return Outcome(case, False, f"client: {type(err).__name__}")
+
+    accepted = "error" not in result
+    if accepted and cleanup and case.kind == "register":
+        try:
+            _delete_registered(tester, result, values)
+        except Exception as err:
+            print(f"cleanup of {values['username']!r} failed: {type(err).__name__}")
+    return Outcome(case, accepted, _error_class(result, values))
+
+def _delete_registered(tester, result, values):
+    """
+    best effort cleanup so thousands of cases dont leave thousands of accounts,
+    done on a throwaway tester so the deleted user's token never ends up on the
+    fuzzing tester (and cleanup calls stay out of the store and profiler)
+    """
+    user_id = result.get("user", {}).get("id")
+    if not user_id:
+        return
+    cleaner = type(tester)(tester.base_url)
+    try:
+        cleaner.login_user(values["username"], values["password"])
+        cleaner.delete_account(user_id, values["username"], values["password"])
+    finally:
+        cleaner.session.close()
+
+def _shrink_candidates(value):
+    """
+    smaller inputs first (drop halves, quarters, ... single chars) then the
+    same length with unusual chars swapped for plain letters
+    """
+    chunk = len(value) // 2
+    while chunk >= 1:
+        for start in range(0, len(value), chunk):
+            yield value[:start] + value[start + chunk:]
+        chunk //= 2
+    for index, ch in enumerate(value):
+        if ch not in ALNUM:
+            yield value[:index] + "x" + value[index + 1:]
+
+def shrink(tester, outcome, budget=100):
+    """
+    greedy shrink of the fuzzed value while the failure key stays the same,
+    returns (minimal_value, requests_spent)
+    """
+    target = outcome.key()
+    value = outcome.case.value
+    spent = 0
+    improved = True
+    while improved and spent < budget:
+        improved = False
+        for candidate in _shrink_candidates(value):
+            if spent >= budget:
+                break
+            if candidate == value:
+                continue
+            spent += 1
+            attempt = run_case(tester, outcome.case.with_value(candidate))
+            if attempt.failed and attempt.key() == target:
+                value = candidate
+                improved = True
+                break
+    return value, spent
+
+def run_fuzz(make_tester, count=2000, workers=16, seed=None, shrink_budget=100):
+    """
+    run `count` generated cases on `workers` threads, returns (passed, failures)
+    where failures is one entry per distinct error class with a shrunk example
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    rng = random.Random(seed)
+    local = threading.local()
+
+    def tester_for_thread():
+        if not hasattr(local, "tester"):
+            local.tester = make_tester()
+        return local.tester
+
+    print(f"\n========== FUZZ MODE ({count} cases, {workers} workers, seed {seed}) ==========")
+    started = time.monotonic()
+    coverage = {}
+    groups = {}
+    passed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = pool.map(lambda case: run_case(tester_for_thread(), case), generate_cases(count, rng))
+        for outcome in outcomes:
+            case = outcome.case
+            row = coverage.setdefault((case.kind, case.field, case.partition), [0, 0, 0])
+            row[2 if outcome.server_error else 0 if outcome.accepted else 1] += 1
+            if not outcome.failed:
+                passed += 1
+                continue
+            group = groups.setdefault(outcome.key(), {"outcome": outcome, "count": 0, "partitions": set()})
+            group["count"] += 1
+            group["partitions"].add(case.partition)
+
+        # shrink one representative per distinct failure, in parallel
+        failures = list(groups.values())
+        shrunk = pool.map(lambda g: shrink(tester_for_thread(), g["outcome"], shrink_budget), failures)
+        for group, (minimal, spent) in zip(failures, shrunk):
+            group["minimal"] = minimal
+            group["shrink_requests"] = spent
+
+    print(f"\n{'kind':<10}{'field':<10}{'partition':<28}{'accept':>8}{'reject':>8}{'error':>7}")
+    for (kind, field, partition), (accepted, rejected, errored) in sorted(coverage.items()):
+        print(f"{kind:<10}{field:<10}{partition:<28}{accepted:>8}{rejected:>8}{errored:>7}")
+
+    print(f"\n{passed}/{count} cases passed in {time.monotonic() - started:.1f}s, {len(failures)} distinct failures")
+    for index, group in enumerate(failures, 1):
+        outcome = group["outcome"]
+        case = outcome.case
+        expected = {True: "accept", False: "reject", None: "no server error"}[outcome.expected]
+        if outcome.error_class.startswith("client:"):
+            got = "client error"
+        else:
+            got = "server error" if outcome.server_error else "accept" if outcome.accepted else "reject"
+        print(f"[{index}] {case.kind} {case.field}: expected {expected}, got {got} (x{group['count']}) class: {outcome.error_class}")
+        print(f"    partitions: {', '.join(sorted(group['partitions']))}")
+        print(f"    minimal: {group['minimal']!r} (from {case.value!r}, {group['shrink_requests']} shrink requests)")
+    return passed, failures
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import http.client
+import json
+import os
+from urllib.parse import urlsplit
+
+"""
+minimal stand in for requests.Session built on http.client
+
+importing requests is most of automated.py startup (~180ms of ~200ms), short
+probes from ci/cron pay that on every call. this covers only what
+PosterAPITester uses
+    - session.get/post/patch/delete(url, json=..., files=...)
+    - session.headers.update(...), session.cookies.set(name, value)
+    - response.raise_for_status(), response.json(), response.text
+connections are kept alive per host, errors look like requests errors
+("401 Client Error: Unauthorized for url: ...") so callers parse them the same way
+
+unlike requests it talks to the host directly (check uses_proxy() first and use
+requests when it says so), does not follow redirects (a 3xx is an error) and only
+retries GET/DELETE when a kept-alive connection was closed under it
+"""
+
+# safe to send twice, a POST/PATCH may already have been applied when the connection dropped
+RETRY_METHODS = ("GET", "DELETE")
+
+class LiteHTTPError(Exception):
+    pass
+
+class LiteCookies(dict):
+    def set(self, name, value):
+        self[name] = value
+
+class LiteResponse:
+    def __init__(self, status_code, reason, content, url, headers=None):
+        self.status_code = status_code
+        self.reason = reason
+        self.content = content
+        self.url = url
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if 300 <= self.status_code < 400:
+            location = self.headers.get("Location", "?")
+            raise LiteHTTPError(f"{self.status_code} Redirect: {self.reason} for url: {self.url} to {location} (not followed, fix base_url)")
+        if 400 <= self.status_code < 500:
+            raise LiteHTTPError(f"{self.status_code} Client Error: {self.reason} for url: {self.url}")
+        if 500 <= self.status_code < 600:
+            raise LiteHTTPError(f"{self.status_code} Server Error: {self.reason} for url: {self.url}")
+
+class LiteSession:
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self.headers = {"User-Agent": "poster-api-tester", "Accept": "application/json"}
+        self.cookies = LiteCookies()
+        self._connections = {}
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def request(self, method, url, json=None, files=None):
+        headers = dict(self.headers)
+        body = None
+        if json is not None:
+            body = _dumps(json)
+            headers["Content-Type"] = "application/json"
+        elif files:
+            body, headers["Content-Type"] = _multipart(files)
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # one retry on a fresh connection if the server closed the kept-alive one,
+        # `last` is set on the attempt that re-raises
+        attempts = (False, True) if method in RETRY_METHODS else (True,)
+        for last in attempts:
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                content = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                self._connections.pop((parts.scheme, parts.netloc), None)
+                if last:
+                    raise
+        if response.will_close:
+            conn.close()
+            self._connections.pop((parts.scheme, parts.netloc), None)
+        return LiteResponse(response.status, response.reason, content, url, response.headers)
+
+    def _connection(self, scheme, netloc):
+        key = (scheme, netloc)
+        conn = self._connections.get(key)
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = self._connections[key] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def close(self):
+        for conn in self._connections.values():
+            conn.close()
+        self._connections.clear()
+
+def uses_proxy(url):
+    """
+    True when urllib (and so requests) would send `url` through a proxy,
+    *_proxy environment variables or system settings minus no_proxy
+    """
+    import urllib.request
+    parts = urlsplit(url)
+    if parts.scheme not in urllib.request.getproxies():
+        return False
+    return not urllib.request.proxy_bypass(parts.hostname or "")
+
+def _dumps(data):
+    # request() has a `json` argument like requests, so the module is used from here
+    return json.dumps(data).encode("utf-8")
+
+def _multipart(files):
+    boundary = os.urandom(16).hex()
+    chunks = []
+    for field, file_obj in files.items():
+        filename = getattr(file_obj, "name", field).rsplit("/", 1)[-1]
+        chunks.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n\r\n'.encode("utf-8")
+        )
+        chunks.append(file_obj.read())
+        chunks.append(b"\r\n")
+    chunks.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(chunks), f"multipart/form-data; boundary={boundary}"
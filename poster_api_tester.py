@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
-import requests
 import os
 
 class PosterAPITester:
-    def __init__(self, base_url="https://api.poster-social.com"):
+    def __init__(self, base_url="https://api.poster-social.com", session=None):
+        """
+        session defaults to a requests.Session, anything with the same
+        get/post/patch/delete, headers and cookies works (see lite_session)
+        """
         self.base_url = base_url
-        self.session = requests.Session()
+        if session is None:
+            # imported here so short probes using LiteSession never pay for requests
+            import requests
+            session = requests.Session()
+        self.session = session
 
     def register_user(self, username, email, password):
         """
@@ -16,6 +23,7 @@ class PosterAPITester:
             "email": email,
             "password": password
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/user/register", json=data)
             response.raise_for_status()
@@ -31,6 +39,7 @@ class PosterAPITester:
             "usernameOrEmail": identifier,
             "password": password
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/user/login", json=data)
             response.raise_for_status()
@@ -48,6 +57,7 @@ class PosterAPITester:
         """
         retrieve a user by username
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/user/profile/{username}")
             response.raise_for_status()
@@ -63,6 +73,7 @@ class PosterAPITester:
             "newEmail": new_email,
             "newUsername": new_username
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/user/update-info", json=data)
             response.raise_for_status()
@@ -82,6 +93,7 @@ class PosterAPITester:
             "usernameOrEmail": username_or_email,
             "password": password
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/user/delete-account", json=data)
             response.raise_for_status()
@@ -95,6 +107,7 @@ class PosterAPITester:
         """
         if not os.path.isfile(file_path):
             return {"error": "file does not exist"}
+        response = None
         try:
             with open(file_path, "rb") as img_file:
                 files = {"image": img_file}
@@ -115,6 +128,7 @@ class PosterAPITester:
             "content": content,
             "images": images
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/post/create", json=data)
             response.raise_for_status()
@@ -131,6 +145,7 @@ class PosterAPITester:
             "recipientId": recipient_id,
             "notificationMessage": notification_message
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/notification/test/create", json=data)
             response.raise_for_status()
@@ -142,6 +157,7 @@ class PosterAPITester:
         """
         retrieve a specific notification given a notificationId
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/notification/{notification_id}")
             response.raise_for_status()
@@ -153,6 +169,7 @@ class PosterAPITester:
         """
         retrieve paginated feed of notifications
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/notification/all/{page_number}")
             response.raise_for_status()
@@ -164,6 +181,7 @@ class PosterAPITester:
         """
         mark notif as read
         """
+        response = None
         try:
             response = self.session.patch(f"{self.base_url}/notification/read/{notification_id}")
             response.raise_for_status()
@@ -175,6 +193,7 @@ class PosterAPITester:
         """
         delete a notification
         """
+        response = None
         try:
             response = self.session.patch(f"{self.base_url}/notification/delete/{notification_id}")
             response.raise_for_status()
@@ -186,6 +205,7 @@ class PosterAPITester:
         """
         retrieve all posts given userId
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/post/author/{user_id}")
             response.raise_for_status()
@@ -197,6 +217,7 @@ class PosterAPITester:
         """
         retrieve post by specific id
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/post/{post_id}")
             response.raise_for_status()
@@ -209,6 +230,7 @@ class PosterAPITester:
         search posts matching a query
         """
         data = {"searchQuery": search_query}
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/post/search", json=data)
             response.raise_for_status()
@@ -221,6 +243,7 @@ class PosterAPITester:
         add comment given a postId
         """
         data = {"postId": post_id, "content": content}
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/comment/create", json=data)
             response.raise_for_status()
@@ -232,6 +255,7 @@ class PosterAPITester:
         """
         delete a comment given a commentId
         """
+        response = None
         try:
             response = self.session.delete(f"{self.base_url}/comment/delete/{comment_id}")
             response.raise_for_status()
@@ -243,6 +267,7 @@ class PosterAPITester:
         """
         retrieve a comment given commentId
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/comment/{comment_id}")
             response.raise_for_status()
@@ -254,6 +279,7 @@ class PosterAPITester:
         """
         retrieve all comments given postId
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/comment/post/{post_id}")
             response.raise_for_status()
@@ -266,6 +292,7 @@ class PosterAPITester:
         toggle like/unlike given commentId
         """
         data = {"commentId": comment_id}
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/comment/like", json=data)
             response.raise_for_status()
@@ -277,6 +304,7 @@ class PosterAPITester:
         """
         delete a post given postId
         """
+        response = None
         try:
             response = self.session.delete(f"{self.base_url}/post/delete/{post_id}")
             response.raise_for_status()
@@ -290,6 +318,7 @@ class PosterAPITester:
         """
         if not os.path.isfile(file_path):
             return {"error": "file does not exist"}
+        response = None
         try:
             with open(file_path, "rb") as img_file:
                 files = {"image": img_file}
@@ -304,6 +333,7 @@ class PosterAPITester:
         toggle follow/unfollow given a userId
         """
         data = {"userIdToFollow": user_id_to_follow}
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/user/follow", json=data)
             response.raise_for_status()
@@ -316,6 +346,7 @@ class PosterAPITester:
         retrieve user feed given a page number
         TODO: this is silly i should not have to provide a page number
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/user/feed/{page}")
             response.raise_for_status()
@@ -327,6 +358,7 @@ class PosterAPITester:
         """
         retrieve list of users the given userId is following
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/user/following/{user_id}")
             response.raise_for_status()
@@ -338,6 +370,7 @@ class PosterAPITester:
         """
         retrieve list of followers given a userId
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/user/followers/{user_id}")
             response.raise_for_status()
@@ -357,6 +390,7 @@ class PosterAPITester:
             "idToReport": id_to_report,
             "userMessage": user_message
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/report/create", json=data)
             response.raise_for_status()
@@ -368,6 +402,7 @@ class PosterAPITester:
         """
         retrieve all reports (only works if user isAdmin)
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/report/all/{page}")
             response.raise_for_status()
@@ -388,6 +423,7 @@ class PosterAPITester:
             "reportId": report_id,
             "action": action
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/report/process", json=data)
             response.raise_for_status()
@@ -400,6 +436,7 @@ class PosterAPITester:
         start a conversation with a list of participants [userId, userId, ...]
         """
         data = {"participants": participants}
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/conversation/create", json=data)
             response.raise_for_status()
@@ -415,6 +452,7 @@ class PosterAPITester:
             "conversationId": conversation_id,
             "content": content
         }
+        response = None
         try:
             response = self.session.post(f"{self.base_url}/message/send", json=data)
             response.raise_for_status()
@@ -426,6 +464,7 @@ class PosterAPITester:
         """
         retrieve all conversations for the logged in user
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/conversation/all")
             response.raise_for_status()
@@ -437,6 +476,7 @@ class PosterAPITester:
         """
         retrieve message thread given conversationId
         """
+        response = None
         try:
             response = self.session.get(f"{self.base_url}/message/thread/{conversation_id}")
             response.raise_for_status()
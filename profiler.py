@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+import cProfile
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+"""
+client side profiler for PosterAPITester
+
+every public tester method becomes an "endpoint", each call is split into phases
+    - serialize, building the request (json encoding, multipart, url/header merge)
+    - connect, opening tcp/tls when the pool has no idle connection
+    - send, writing the request line, headers and body to the socket
+    - wait, waiting on the server until the response headers are read
+    - receive, reading the response body
+    - decode, response.json()
+    - overhead, whatever is left (url f-strings, try/except, prints, ...)
+
+cpu is per thread cpu time for the whole call so it stays correct with several
+load workers, if cpu per request is close to wall per request the client is the
+bottleneck and we need more workers, not a faster api
+"""
+
+PHASES = ("serialize", "connect", "send", "wait", "receive", "decode", "overhead")
+
+_local = threading.local()
+
+@contextmanager
+def _phase(name):
+    """
+    add time spent in the block to the current call record, nested phases are
+    subtracted from their parent so connect is not counted twice inside send
+    """
+    record = getattr(_local, "record", None)
+    if record is None:
+        yield
+        return
+    stack = _local.stack
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = stack.pop()
+        record[name] = record.get(name, 0.0) + elapsed - nested
+        if stack:
+            stack[-1] += elapsed
+
+class _TimedConnectionMixin:
+    def connect(self):
+        with _phase("connect"):
+            return super().connect()
+
+    def request(self, *args, **kwargs):
+        with _phase("send"):
+            return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        with _phase("wait"):
+            return super().getresponse(*args, **kwargs)
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class _ProfilingAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+class ProfilingSession(requests.Session):
+    """
+    requests session that reports serialize/receive/decode into the current call
+    and mounts adapters whose connections report connect/send/wait
+    """
+    def __init__(self):
+        super().__init__()
+        self.mount("https://", _ProfilingAdapter())
+        self.mount("http://", _ProfilingAdapter())
+
+    def prepare_request(self, request):
+        with _phase("serialize"):
+            return super().prepare_request(request)
+
+    def send(self, request, **kwargs):
+        # always stream so reading the body can be timed on its own
+        stream = kwargs.pop("stream", False)
+        response = super().send(request, stream=True, **kwargs)
+        if not stream:
+            with _phase("receive"):
+                response.content
+        json_fn = response.json
+
+        def timed_json(**json_kwargs):
+            with _phase("decode"):
+                return json_fn(**json_kwargs)
+
+        response.json = timed_json
+        return response
+
+class ClientProfiler:
+    def __init__(self, cprofile_dir=None):
+        self.cprofile_dir = cprofile_dir
+        self.stats = {}
+        self.profiles = {}
+        self._lock = threading.Lock()
+
+    def attach(self, tester):
+        """
+        swap in a ProfilingSession (keeping headers/cookies) and wrap every public
+        tester method so each call is recorded against its method name
+        """
+        session = ProfilingSession()
+        session.headers.update(tester.session.headers)
+        session.cookies.update(tester.session.cookies)
+        tester.session = session
+        for name in dir(type(tester)):
+            if name.startswith("_"):
+                continue
+            method = getattr(tester, name)
+            if callable(method):
+                setattr(tester, name, self._wrap(name, method))
+        return tester
+
+    def _wrap(self, endpoint, method):
+        def wrapper(*args, **kwargs):
+            record = {}
+            _local.record = record
+            _local.stack = []
+            profile = self._start_cprofile(endpoint)
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                cpu = time.thread_time() - cpu_start
+                wall = time.perf_counter() - wall_start
+                if profile is not None:
+                    profile.disable()
+                _local.record = None
+                record["overhead"] = max(wall - sum(record.values()), 0.0)
+                self._add(endpoint, wall, cpu, record)
+
+        wrapper.__name__ = endpoint
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    def _start_cprofile(self, endpoint):
+        if not self.cprofile_dir:
+            return None
+        # a Profile must only ever run on one thread, workers get their own and
+        # dump_cprofile merges them per endpoint
+        key = (threading.get_ident(), endpoint)
+        with self._lock:
+            profile = self.profiles.get(key)
+            if profile is None:
+                profile = self.profiles[key] = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is already active on this thread/interpreter
+            # (3.12+ allows only one per interpreter, that call goes unprofiled)
+            return None
+        return profile
+
+    def _add(self, endpoint, wall, cpu, record):
+        with self._lock:
+            entry = self.stats.setdefault(endpoint, {"calls": 0, "wall": 0.0, "cpu": 0.0, "phases": dict.fromkeys(PHASES, 0.0)})
+            entry["calls"] += 1
+            entry["wall"] += wall
+            entry["cpu"] += cpu
+            for name, seconds in record.items():
+                entry["phases"][name] += seconds
+
+    def dump_cprofile(self):
+        """
+        write one .prof file per endpoint (all threads merged), open with
+        `python -m pstats` or snakeviz
+        """
+        if not self.cprofile_dir:
+            return []
+        os.makedirs(self.cprofile_dir, exist_ok=True)
+        merged = {}
+        with self._lock:
+            for (_, endpoint), profile in self.profiles.items():
+                if endpoint in merged:
+                    merged[endpoint].add(profile)
+                else:
+                    merged[endpoint] = pstats.Stats(profile)
+        written = []
+        for endpoint in sorted(merged):
+            path = os.path.join(self.cprofile_dir, f"{endpoint}.prof")
+            merged[endpoint].dump_stats(path)
+            written.append(path)
+        return written
+
+    def report(self):
+        """
+        print mean ms per call for every phase plus client cpu per request
+        """
+        with self._lock:
+            stats = {k: {**v, "phases": dict(v["phases"])} for k, v in self.stats.items()}
+        if not stats:
+            print("\nno calls profiled")
+            return
+
+        print("\n========== CLIENT PROFILE (mean ms per call) ==========")
+        header = f"{'endpoint':<28}{'calls':>6}{'wall':>9}" + "".join(f"{p:>10}" for p in PHASES) + f"{'cpu':>9}"
+        print(header)
+        total_calls = total_wall = total_cpu = 0
+        for endpoint in sorted(stats):
+            entry = stats[endpoint]
+            calls = entry["calls"]
+            line = f"{endpoint:<28}{calls:>6}{entry['wall'] / calls * 1000:>9.2f}"
+            line += "".join(f"{entry['phases'][p] / calls * 1000:>10.2f}" for p in PHASES)
+            line += f"{entry['cpu'] / calls * 1000:>9.2f}"
+            print(line)
+            total_calls += calls
+            total_wall += entry["wall"]
+            total_cpu += entry["cpu"]
+
+        if self.cprofile_dir:
+            # cProfile hooks every python call, cpu and phases above include that cost
+            print("\ncProfile was on, timings include its instrumentation overhead, "
+                  "run with --profile alone for client cpu per request")
+        else:
+            cpu_per_request = total_cpu / total_calls
+            print(f"\nclient cpu per request: {cpu_per_request * 1000:.2f} ms ({total_cpu / total_wall:.0%} of wall time)")
+            if cpu_per_request > 0:
+                print(f"one load worker saturates a core at ~{1 / cpu_per_request:.0f} req/s")
+
+        for path in self.dump_cprofile():
+            print(f"cProfile written: {path}")
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import threading
+import time
+import uuid
+
+"""
+soak mode, run a scenario for a fixed duration and keep memory flat
+
+nothing per request is kept, every call goes into a fixed size latency histogram
+and an error counter for its endpoint. every window the counters are written as
+one json line to the output file and reset, so hours of load is a few kb of disk
+and the same few kb of memory
+
+each line also has client rss so we can tell a leaking tester apart from a
+degrading server, and p50/p99 are compared against the first window (drift)
+"""
+
+class LatencyHistogram:
+    """
+    log bucketed latency histogram, 0.1ms .. 10min with ~5% relative error,
+    memory is the same after 10 requests or 10 million
+    """
+    MIN_MS = 0.1
+    GROWTH = 1.05
+    BUCKETS = int(math.log(600000 / MIN_MS) / math.log(GROWTH)) + 2
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        if ms <= self.MIN_MS:
+            index = 0
+        else:
+            index = min(int(math.log(ms / self.MIN_MS) / math.log(self.GROWTH)) + 1, self.BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q):
+        """
+        upper bound of the bucket holding the q-th percentile (q in 0..100), in ms
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * q / 100), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.MIN_MS * self.GROWTH ** index, self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "n": self.count,
+            "mean": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50": round(self.percentile(50), 2),
+            "p95": round(self.percentile(95), 2),
+            "p99": round(self.percentile(99), 2),
+            "max": round(self.max_ms, 2)
+        }
+
+def current_rss_mb():
+    """
+    resident set size of this process in MB, None if the platform cant tell us
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1048576
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # no /proc (macOS), peak rss is the best we get and it is in bytes there
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1048576
+
+class SoakAggregator:
+    def __init__(self, out_path):
+        self.out_path = out_path
+        self.window = {}
+        self.totals = {}
+        self.window_index = 0
+        self.baseline = None
+        self.first_rss = None
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, ok):
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry["hist"].add(seconds)
+            if not ok:
+                entry["errors"] += 1
+
+    def record_error(self, endpoint):
+        """
+        error without a latency sample (the call raised), so an outage shows up
+        as errors instead of dragging p50/p99 towards zero
+        """
+        with self._lock:
+            self._entry(endpoint)["errors"] += 1
+
+    def _entry(self, endpoint):
+        entry = self.window.get(endpoint)
+        if entry is None:
+            entry = self.window[endpoint] = {"hist": LatencyHistogram(), "errors": 0}
+        return entry
+
+    def pending(self):
+        with self._lock:
+            return bool(self.window)
+
+    def roll(self):
+        """
+        close the current window, append it to the output file and print a drift line
+        """
+        with self._lock:
+            window, self.window = self.window, {}
+
+        combined = LatencyHistogram()
+        errors = 0
+        endpoints = {}
+        for endpoint, entry in window.items():
+            combined.merge(entry["hist"])
+            errors += entry["errors"]
+            endpoints[endpoint] = {**entry["hist"].summary(), "err": entry["errors"]}
+            total = self.totals.setdefault(endpoint, {"hist": LatencyHistogram(), "errors": 0})
+            total["hist"].merge(entry["hist"])
+            total["errors"] += entry["errors"]
+
+        rss = current_rss_mb()
+        line = {
+            "t": round(time.time(), 3),
+            "window": self.window_index,
+            "elapsed": round(time.time() - self.started, 1),
+            "rss_mb": round(rss, 2) if rss is not None else None,
+            "all": {**combined.summary(), "err": errors},
+            "endpoints": endpoints
+        }
+        with open(self.out_path, "a") as out:
+            out.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+        p50 = combined.percentile(50)
+        p99 = combined.percentile(99)
+        if self.baseline is None and combined.count:
+            self.baseline = (p50, p99)
+        if self.first_rss is None and rss is not None:
+            self.first_rss = rss
+        print(f"[window {self.window_index}] {combined.count} req, {errors} err, "
+              f"p50 {p50:.1f}ms ({self._drift(p50, 0)}), p99 {p99:.1f}ms ({self._drift(p99, 1)}), "
+              f"rss {self._rss_text(rss)}")
+        self.window_index += 1
+
+    def _drift(self, value, which):
+        # value is 0 when the window only had errors, that is not a speedup
+        if not self.baseline or not self.baseline[which] or not value:
+            return "n/a"
+        return f"{(value / self.baseline[which] - 1) * 100:+.0f}%"
+
+    def _rss_text(self, rss):
+        if rss is None:
+            return "n/a"
+        return f"{rss:.1f}MB ({rss - self.first_rss:+.1f}MB)"
+
+    def report(self):
+        print("\n========== SOAK SUMMARY ==========")
+        print(f"{'endpoint':<28}{'n':>9}{'err':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>10}")
+        for endpoint in sorted(self.totals):
+            total = self.totals[endpoint]
+            s = total["hist"].summary()
+            print(f"{endpoint:<28}{s['n']:>9}{total['errors']:>7}{s['p50']:>9.1f}{s['p95']:>9.1f}{s['p99']:>9.1f}{s['max']:>10.1f}")
+        print(f"windows written to {self.out_path}")
+
+def timed(aggregator, endpoint, fn, *args):
+    """
+    call a tester method, record latency and whether it returned an error,
+    if it raises the error is recorded under `endpoint` and re-raised
+    """
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception:
+        aggregator.record_error(endpoint)
+        raise
+    aggregator.record(endpoint, time.perf_counter() - start, "error" not in result)
+    return result
+
+def scenario_get(tester, aggregator, username, user_id):
+    """
+    the read only endpoints from get mode
+    """
+    timed(aggregator, "get_profile", tester.get_profile, username)
+    timed(aggregator, "get_feed", tester.get_feed, 1)
+    timed(aggregator, "get_notification_feed", tester.get_notification_feed, 1)
+    timed(aggregator, "get_conversations", tester.get_conversations)
+    timed(aggregator, "get_following", tester.get_following, user_id)
+    timed(aggregator, "get_followers", tester.get_followers, user_id)
+    timed(aggregator, "search_posts", tester.search_posts, "litterally anything")
+
+def scenario_set(tester, aggregator, username, user_id):
+    """
+    create post -> comment -> like -> delete, leaves no data behind when it succeeds
+    """
+    post = timed(aggregator, "create_post", tester.create_post, f"soak post {uuid.uuid4()}", "soak test post")
+    post_id = post.get("postId")
+    if not post_id:
+        return
+    comment = timed(aggregator, "add_comment_to_post", tester.add_comment_to_post, post_id, "soak test comment")
+    comment_id = comment.get("commentId")
+    if comment_id:
+        timed(aggregator, "like_comment", tester.like_comment, comment_id)
+        timed(aggregator, "delete_comment", tester.delete_comment, comment_id)
+    timed(aggregator, "delete_post", tester.delete_post, post_id)
+
+SCENARIOS = {"get": scenario_get, "set": scenario_set}
+
+def _worker(make_tester, scenario, aggregator, stop, username, password):
+    tester = make_tester()
+    user_id = username
+    while not stop.is_set():
+        try:
+            login = timed(aggregator, "login_user", tester.login_user, username, password)
+        except Exception as err:
+            # already counted as a login_user error by timed()
+            print(f"login error: {type(err).__name__}: {err}")
+            login = {}
+        if "token" in login:
+            user_id = login.get("user", {}).get("id", username)
+            break
+        stop.wait(1)
+
+    while not stop.is_set():
+        try:
+            scenario(tester, aggregator, username, user_id)
+        except Exception as err:
+            # keep soaking, timed() already counted the error against its endpoint
+            print(f"scenario error: {type(err).__name__}: {err}")
+            stop.wait(1)
+
+def run_soak(make_tester, duration, username, password, window=60, out_path="soak.jsonl", workers=1, scenario="get"):
+    """
+    run `scenario` on `workers` threads for `duration` seconds as `username`
+    (from the config profile), one json line per window
+    """
+    aggregator = SoakAggregator(out_path)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_worker, args=(make_tester, SCENARIOS[scenario], aggregator, stop, username, password), daemon=True)
+        for _ in range(workers)
+    ]
+    print(f"\n========== SOAK MODE ({scenario}, {workers} workers, {duration}s, {window}s windows) ==========")
+    for thread in threads:
+        thread.start()
+
+    deadline = time.monotonic() + duration
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(window, remaining))
+            aggregator.roll()
+    except KeyboardInterrupt:
+        print("\nsoak interrupted, writing last window")
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=30)
+        # calls that finished after the last roll, or everything since it when interrupted
+        if aggregator.pending():
+            aggregator.roll()
+
+    aggregator.report()
+    return aggregator
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+"""
+persistent result store, one sqlite file shared by every run
+
+    runs      one row per automated.py invocation (base_url, mode, git commit, concurrency, ...)
+    endpoints endpoint name <-> small integer id, so results rows stay narrow
+    results   one row per tester call (run, endpoint id, start time, duration, ok)
+
+rows are buffered and written in batches so recording stays cheap under load. the
+results index covers every column, per endpoint and time range lookups never touch
+the table, and percentiles are picked in sqlite instead of sorting rows in python
+
+soak runs only get a runs row, their per window rollups live in the soak --out
+file, one row per call for hours is exactly what soak mode exists to avoid
+"""
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    base_url TEXT,
+    mode TEXT,
+    git_commit TEXT,
+    concurrency INTEGER,
+    argv TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS endpoints (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    endpoint_id INTEGER NOT NULL REFERENCES endpoints(id),
+    started_at REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    ok INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_covering ON results (run_id, endpoint_id, started_at, duration_ms, ok);
+"""
+
+# version 1 kept the endpoint name on every results row
+MIGRATE_V1 = """
+ALTER TABLE results RENAME TO results_v1;
+DROP INDEX IF EXISTS results_run_endpoint_time;
+""" + SCHEMA + """
+INSERT OR IGNORE INTO endpoints (name) SELECT DISTINCT endpoint FROM results_v1;
+INSERT INTO results SELECT r.run_id, e.id, r.started_at, r.duration_ms, r.ok
+    FROM results_v1 r JOIN endpoints e ON e.name = r.endpoint;
+DROP TABLE results_v1;
+"""
+
+def git_commit():
+    """
+    short commit of this checkout, None outside of git
+
+    reads .git directly first, spawning git costs more than a whole probe
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    git_dir = os.path.join(root, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as head_file:
+            head = head_file.read().strip()
+        if not head.startswith("ref: "):
+            return head[:7]
+        ref = head[5:]
+        ref_path = os.path.join(git_dir, ref)
+        if os.path.isfile(ref_path):
+            with open(ref_path) as ref_file:
+                return ref_file.read().strip()[:7]
+        with open(os.path.join(git_dir, "packed-refs")) as packed:
+            for line in packed:
+                if line.rstrip().endswith(" " + ref):
+                    return line[:7]
+    except OSError:
+        pass
+    import subprocess
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+def _rank(count, q):
+    """
+    1 based row number of the q-th percentile in `count` sorted values
+    """
+    return min(int(count * q / 100), count - 1) + 1
+
+class ResultStore:
+    def __init__(self, path="poster_results.db", batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.run_id = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._endpoint_ids = {}
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+            self.conn.executescript(MIGRATE_V1 if "endpoint" in columns else SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.commit()
+
+    def start_run(self, base_url, mode, concurrency=1):
+        with self._lock:
+            cur = self.conn.execute(
+                "INSERT INTO runs (started_at, base_url, mode, git_commit, concurrency, argv, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), base_url, mode, git_commit(), concurrency, " ".join(sys.argv[1:]), "running")
+            )
+            self.conn.commit()
+            self.run_id = cur.lastrowid
+        return self.run_id
+
+    def finish_run(self, status):
+        self.flush()
+        with self._lock:
+            self.conn.execute("UPDATE runs SET finished_at = ?, status = ? WHERE id = ?", (time.time(), status, self.run_id))
+            self.conn.commit()
+        print(f"\nrun {self.run_id} stored in {self.path} ({status})")
+
+    def attach(self, tester):
+        """
+        wrap every public tester method so each call becomes a results row
+        """
+        for name in dir(type(tester)):
+            if name.startswith("_"):
+                continue
+            method = getattr(tester, name)
+            if callable(method):
+                setattr(tester, name, self._wrap(name, method))
+        return tester
+
+    def _wrap(self, endpoint, method):
+        def wrapper(*args, **kwargs):
+            started_at = time.time()
+            start = time.perf_counter()
+            result = None
+            try:
+                result = method(*args, **kwargs)
+                return result
+            finally:
+                ok = isinstance(result, dict) and "error" not in result
+                self.record(endpoint, started_at, (time.perf_counter() - start) * 1000, ok)
+
+        wrapper.__name__ = endpoint
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    def _endpoint_id(self, name):
+        # called with the lock held
+        endpoint_id = self._endpoint_ids.get(name)
+        if endpoint_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO endpoints (name) VALUES (?)", (name,))
+            endpoint_id = self.conn.execute("SELECT id FROM endpoints WHERE name = ?", (name,)).fetchone()[0]
+            self._endpoint_ids[name] = endpoint_id
+        return endpoint_id
+
+    def record(self, endpoint, started_at, duration_ms, ok):
+        with self._lock:
+            self._pending.append((self.run_id, self._endpoint_id(endpoint), started_at, duration_ms, int(ok)))
+            if len(self._pending) < self.batch_size:
+                return
+            self._write_pending()
+
+    def flush(self):
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        if self._pending:
+            self.conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?)", self._pending)
+            self.conn.commit()
+            self._pending = []
+
+    def list_runs(self, limit=20):
+        rows = self.conn.execute(
+            "SELECT r.id, r.started_at, r.finished_at, r.mode, r.base_url, r.git_commit, r.concurrency, r.status, "
+            "(SELECT COUNT(*) FROM results WHERE run_id = r.id) FROM runs r ORDER BY r.id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        print(f"{'run':>5}  {'started':<19}  {'secs':>7}  {'mode':<6}{'commit':<10}{'conc':>5}{'requests':>10}  {'status':<12}base_url")
+        for run_id, started, finished, mode, base_url, commit, concurrency, status, count in rows:
+            secs = f"{finished - started:.1f}" if finished else "-"
+            started_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started))
+            print(f"{run_id:>5}  {started_text:<19}  {secs:>7}  {mode or '-':<6}{commit or '-':<10}{concurrency or 0:>5}{count:>10}  {status or '-':<12}{base_url}")
+
+    def endpoint_stats(self, run_id, endpoint=None, since=None, until=None):
+        """
+        per endpoint n, error rate and latency percentiles for one run,
+        since/until are seconds from the start of that run
+        """
+        row = self.conn.execute("SELECT started_at, mode FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"run {run_id} not found in {self.path}")
+        run_start, mode = row
+        if mode == "soak":
+            raise ValueError(f"run {run_id} is a soak run, its per window results are in the soak --out file")
+
+        endpoints = self.conn.execute(
+            "SELECT e.id, e.name FROM endpoints e WHERE EXISTS "
+            "(SELECT 1 FROM results WHERE run_id = ? AND endpoint_id = e.id)", (run_id,)
+        ).fetchall()
+        if endpoint:
+            endpoints = [(endpoint_id, name) for endpoint_id, name in endpoints if name == endpoint]
+
+        where = "run_id = ? AND endpoint_id = ?"
+        bounds = []
+        if since is not None:
+            where += " AND started_at >= ?"
+            bounds.append(run_start + since)
+        if until is not None:
+            where += " AND started_at < ?"
+            bounds.append(run_start + until)
+
+        stats = {}
+        for endpoint_id, name in endpoints:
+            params = (run_id, endpoint_id, *bounds)
+            count, errors = self.conn.execute(f"SELECT COUNT(*), COUNT(*) - SUM(ok) FROM results WHERE {where}", params).fetchone()
+            if not count:
+                continue
+            ranks = {q: _rank(count, q) for q in (50, 95, 99)}
+            picked = dict(self.conn.execute(
+                f"SELECT rn, duration_ms FROM (SELECT duration_ms, ROW_NUMBER() OVER (ORDER BY duration_ms) AS rn "
+                f"FROM results WHERE {where}) WHERE rn IN (?, ?, ?)", (*params, *ranks.values())
+            ).fetchall())
+            stats[name] = {
+                "n": count,
+                "err_pct": errors / count * 100,
+                **{f"p{q}": picked[rank] for q, rank in ranks.items()}
+            }
+        return stats
+
+    def show_run(self, run_id, endpoint=None, since=None, until=None):
+        stats = self.endpoint_stats(run_id, endpoint, since, until)
+        print(f"\n========== RUN {run_id} ==========")
+        print(f"{'endpoint':<28}{'n':>8}{'err%':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for name in sorted(stats):
+            s = stats[name]
+            print(f"{name:<28}{s['n']:>8}{s['err_pct']:>8.1f}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}")
+
+    def compare(self, base_run, new_run, endpoint=None, since=None, until=None):
+        """
+        per endpoint latency and error deltas, new_run relative to base_run
+        """
+        base = self.endpoint_stats(base_run, endpoint, since, until)
+        new = self.endpoint_stats(new_run, endpoint, since, until)
+        print(f"\n========== COMPARE run {base_run} -> run {new_run} (ms) ==========")
+        print(f"{'endpoint':<28}{'n':>13}{'err%':>15}{'p50':>22}{'p95':>22}{'p99':>22}")
+        for name in sorted(set(base) | set(new)):
+            if name not in base or name not in new:
+                print(f"{name:<28}  only in run {base_run if name in base else new_run}")
+                continue
+            a, b = base[name], new[name]
+            line = f"{name:<28}{a['n']:>6} {b['n']:>6}{a['err_pct']:>7.1f} {b['err_pct'] - a['err_pct']:>+6.1f}pp"
+            for key in ("p50", "p95", "p99"):
+                change = f"{(b[key] / a[key] - 1) * 100:+.0f}%" if a[key] else "n/a"
+                line += f"{a[key]:>8.1f} {b[key]:>7.1f} {change:>5}"
+            print(line)
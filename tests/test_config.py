@@ -0,0 +1,83 @@
+import base64
+import json
+import os
+import time
+
+import pytest
+
+import config
+from config import DEFAULTS, _token_expiry, cached_token, load_config, save_token
+
+INI = """
+[prod]
+base_url = https://file.example
+
+[staging]
+base_url = https://staging.example
+username = stager
+"""
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch, tmp_path):
+    for key in list(os.environ):
+        if key.startswith("POSTER_"):
+            monkeypatch.delenv(key)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    # keep a poster.ini in the working directory out of the tests
+    monkeypatch.chdir(tmp_path)
+
+@pytest.fixture
+def ini(tmp_path):
+    path = tmp_path / "poster.test.ini"
+    path.write_text(INI)
+    return str(path)
+
+def test_defaults_without_a_file():
+    cfg = load_config()
+    assert cfg == {**DEFAULTS, "env": "prod"}
+
+def test_file_then_env_section_then_overrides(ini, monkeypatch):
+    assert load_config(path=ini)["base_url"] == "https://file.example"
+
+    staging = load_config("staging", ini)
+    assert staging["base_url"] == "https://staging.example"
+    assert staging["username"] == "stager"
+    assert staging["password"] == DEFAULTS["password"]
+
+    monkeypatch.setenv("POSTER_ENV", "staging")
+    assert load_config(path=ini)["env"] == "staging"
+    monkeypatch.setenv("POSTER_BASE_URL", "http://localhost:3000")
+    assert load_config(path=ini)["base_url"] == "http://localhost:3000"
+    # --env beats POSTER_ENV
+    assert load_config("prod", ini)["username"] == DEFAULTS["username"]
+
+def test_config_file_from_environment(ini, monkeypatch):
+    monkeypatch.setenv("POSTER_CONFIG", ini)
+    assert load_config("staging")["username"] == "stager"
+
+def test_missing_explicit_file_or_profile(ini):
+    with pytest.raises(ValueError, match="not found or unreadable"):
+        load_config(path=ini + ".typo")
+    with pytest.raises(ValueError, match="profile 'qa'"):
+        load_config("qa", ini)
+
+def jwt(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.signature"
+
+def test_token_expiry():
+    assert _token_expiry(jwt({"sub": "1", "exp": 1900000000}), 3600) == 1900000000
+    for token in ("opaque-token", jwt({"sub": "1"}), "a.!!!.c"):
+        assert abs(_token_expiry(token, 3600) - (time.time() + 3600)) < 5
+
+def test_token_cache_round_trip():
+    cfg = load_config()
+    token = jwt({"exp": time.time() + 600})
+    save_token(cfg, token)
+    assert cached_token(cfg) == token
+    assert os.stat(config._cache_path(cfg)).st_mode & 0o777 == 0o600
+    assert cached_token({**cfg, "username": "someone_else"}) is None
+
+    # inside the expiry skew counts as expired
+    save_token(cfg, jwt({"exp": time.time() + config.EXPIRY_SKEW / 2}))
+    assert cached_token(cfg) is None
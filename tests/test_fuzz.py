@@ -0,0 +1,68 @@
+import json
+
+from fuzz import Case, Outcome, _error_class, expect_email, expect_password, expect_username, shrink
+
+def test_username_boundary_3_4():
+    assert expect_username("abc") is False
+    assert expect_username("abcd") is True
+    assert expect_username("ab_d") is True
+    # unknown server rule, only a 5xx counts as a failure
+    assert expect_username("ab!d") is None
+
+def test_password_boundary_7_8():
+    assert expect_password("Aa1@xyz") is False
+    assert expect_password("Aa1@wxyz") is True
+    assert expect_password("aa1@wxyz") is False
+    assert expect_password("Aa1@wxyé") is None
+
+def test_email_oracle():
+    assert expect_email("someone@example.com") is True
+    assert expect_email("someone.example.com") is False
+    assert expect_email("a..b@example.com") is None
+    too_long = "a" * 64 + "@" + "b" * 185 + ".com"
+    assert len(too_long) == 254
+    assert expect_email(too_long) is True
+    assert expect_email("a" + too_long) is None
+
+def test_error_class_masks_inputs():
+    values = {"username": "fzabc123", "email": "fzabc123@example.com", "password": "Aa1@x"}
+    result = {
+        "error": "400 Client Error: Bad Request for url: http://api/user/register",
+        "response": json.dumps({"message": "username fzabc123 is taken"})
+    }
+    assert _error_class(result, values) == "400 username <username> is taken"
+    assert _error_class({"user": {}}, values) == "accepted"
+    assert _error_class({"error": "HTTPConnectionPool(host='api'): refused", "response": ""}, values) \
+        == "client: HTTPConnectionPool(host='api')"
+
+class FakeTester:
+    """
+    500s on any username containing "!", accepts everything else
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def register_user(self, username, email, password):
+        self.calls += 1
+        if "!" in username:
+            return {"error": "500 Server Error: Internal Server Error", "response": json.dumps({"message": f"crashed on {username}"})}
+        # no user id, so run_case has nothing to clean up
+        return {"user": {}}
+
+def test_shrink_keeps_failure_and_minimises():
+    tester = FakeTester()
+    case = Case("register", "username", "special_'!'", "abcdefgh!ijklmnop")
+    outcome = Outcome(case, False, "500 crashed on <username>")
+    assert outcome.failed
+
+    minimal, spent = shrink(tester, outcome, budget=100)
+    # 3 chars would flip the oracle to reject, a different failure
+    assert len(minimal) == 4 and "!" in minimal
+    assert spent == tester.calls <= 100
+
+def test_shrink_respects_budget():
+    tester = FakeTester()
+    case = Case("register", "username", "len_256", "!" * 256)
+    outcome = Outcome(case, False, "500 crashed on <username>")
+    _, spent = shrink(tester, outcome, budget=5)
+    assert spent == tester.calls == 5
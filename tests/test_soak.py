@@ -0,0 +1,53 @@
+import json
+
+from soak import LatencyHistogram, SoakAggregator
+
+def histogram_of(ms_values):
+    hist = LatencyHistogram()
+    for ms in ms_values:
+        hist.add(ms / 1000)
+    return hist
+
+def test_percentiles_within_bucket_error():
+    hist = histogram_of(range(1, 101))
+    for q, exact in ((50, 50), (95, 95), (99, 99)):
+        assert exact <= hist.percentile(q) <= exact * LatencyHistogram.GROWTH
+    assert hist.percentile(100) == 100
+
+def test_percentile_never_above_max():
+    hist = histogram_of([3.0] * 10)
+    assert hist.percentile(50) == hist.percentile(99) == 3.0
+
+def test_empty_and_tiny_samples():
+    assert LatencyHistogram().percentile(50) == 0.0
+    hist = histogram_of([0.01, 0.05])
+    assert hist.counts[0] == 2
+    assert hist.percentile(99) <= LatencyHistogram.MIN_MS
+
+def test_merge_matches_single_histogram():
+    merged = histogram_of(range(1, 51))
+    merged.merge(histogram_of(range(51, 101)))
+    single = histogram_of(range(1, 101))
+    assert merged.counts == single.counts
+    assert merged.summary() == single.summary()
+
+def test_drift_against_first_window(tmp_path, capsys):
+    out = tmp_path / "soak.jsonl"
+    aggregator = SoakAggregator(str(out))
+    assert aggregator._drift(10, 0) == "n/a"
+
+    aggregator.record("get_feed", 0.010, True)
+    aggregator.roll()
+    p50 = aggregator.baseline[0]
+    assert aggregator._drift(p50 * 1.2, 0) == "+20%"
+    assert aggregator._drift(p50 / 2, 0) == "-50%"
+    # a window with only errors has no latency, that is not a -100% speedup
+    assert aggregator._drift(0, 0) == "n/a"
+
+    aggregator.record_error("get_feed")
+    aggregator.roll()
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [line["window"] for line in lines] == [0, 1]
+    assert lines[0]["endpoints"]["get_feed"]["n"] == 1
+    assert lines[1]["all"] == {**LatencyHistogram().summary(), "err": 1}
+    assert "p50 0.0ms (n/a)" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+from store import ResultStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    yield store
+    store.conn.close()
+
+def run_start(store, run_id):
+    return store.conn.execute("SELECT started_at FROM runs WHERE id = ?", (run_id,)).fetchone()[0]
+
+def test_percentiles_and_errors(store):
+    run_id = store.start_run("http://api", "get")
+    start = run_start(store, run_id)
+    for ms in range(1, 101):
+        store.record("get_feed", start + 1, float(ms), ms % 10 != 0)
+    store.record("get_profile", start + 1, 5.0, True)
+    store.flush()
+
+    stats = store.endpoint_stats(run_id)
+    assert stats["get_feed"] == {"n": 100, "err_pct": 10.0, "p50": 51.0, "p95": 96.0, "p99": 100.0}
+    assert stats["get_profile"]["p99"] == 5.0
+    assert list(store.endpoint_stats(run_id, endpoint="get_profile")) == ["get_profile"]
+
+def test_since_until_are_relative_to_run_start(store):
+    run_id = store.start_run("http://api", "get")
+    start = run_start(store, run_id)
+    for offset, ms in ((1, 10.0), (5, 20.0), (10, 30.0)):
+        store.record("get_feed", start + offset, ms, True)
+    store.flush()
+
+    def n(**bounds):
+        return store.endpoint_stats(run_id, **bounds).get("get_feed", {}).get("n", 0)
+
+    assert n() == 3
+    assert n(since=2) == 2
+    assert n(until=5) == 1
+    assert n(since=5, until=10) == 1
+    assert n(since=11) == 0
+    assert store.endpoint_stats(run_id, since=2, until=6)["get_feed"]["p50"] == 20.0
+
+def test_runs_are_separate(store):
+    first = store.start_run("http://api", "get")
+    store.record("get_feed", run_start(store, first), 10.0, True)
+    second = store.start_run("http://api", "get")
+    store.record("get_feed", run_start(store, second), 20.0, False)
+    store.flush()
+    assert store.endpoint_stats(first)["get_feed"]["err_pct"] == 0.0
+    assert store.endpoint_stats(second)["get_feed"]["p50"] == 20.0
+
+def test_unknown_and_soak_runs_raise(store):
+    with pytest.raises(ValueError):
+        store.endpoint_stats(42)
+    run_id = store.start_run("http://api", "soak")
+    with pytest.raises(ValueError, match="soak"):
+        store.endpoint_stats(run_id)
+
+def test_migrates_version_1_db(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE runs (id INTEGER PRIMARY KEY, started_at REAL NOT NULL, finished_at REAL, base_url TEXT,
+                           mode TEXT, git_commit TEXT, concurrency INTEGER, argv TEXT, status TEXT);
+        CREATE TABLE results (run_id INTEGER NOT NULL, endpoint TEXT NOT NULL, started_at REAL NOT NULL,
+                              duration_ms REAL NOT NULL, ok INTEGER NOT NULL);
+        CREATE INDEX results_run_endpoint_time ON results (run_id, endpoint, started_at);
+        INSERT INTO runs (id, started_at, mode) VALUES (1, 100.0, 'get');
+        INSERT INTO results VALUES (1, 'get_feed', 101.0, 12.5, 1), (1, 'login_user', 101.0, 3.0, 0);
+    """)
+    conn.commit()
+    conn.close()
+
+    store = ResultStore(path)
+    stats = store.endpoint_stats(1)
+    assert stats["get_feed"]["p50"] == 12.5
+    assert stats["login_user"]["err_pct"] == 100.0
+    store.conn.close()